@@ -3,14 +3,24 @@ RF433pico is a Micropython library to connect RF433mhz receivers such as MX-05V,
 The code was based on https://github.com/AdrianCX/pico433mhz library and contains little modifications.
 """
 
-import time
-from machine import Pin
+import micropython
+import rp2
+import uctypes
+from array import array
+from time import ticks_us, ticks_diff, sleep_us
+from machine import Pin, Timer
 from micropython import schedule
 from collections import namedtuple
 
 MAX_CHANGES: int = 67
 DEFAULT_TRANSMITTER_PIN: int = 27
 DEFAULT_RECEIVER_PIN: int = 22
+DEFAULT_TRANSMITTER_STATE_MACHINE: int = 0
+RX_RING_SIZE: int = 128  # edges, must be a power of two
+RX_POLL_PERIOD_MS: int = 5
+
+# PIO state machine ids claimed by enabled receivers and transmitters
+_state_machines_in_use: set = set()
 
 Protocol = namedtuple(
     "Protocol",
@@ -35,16 +45,36 @@ PROTOCOLS = (
 )
 
 
+def _no_print(*args, **kwargs):
+    pass
+
+
 class RFBase:
     def __init__(self, pin_number: int = None, debug: bool = False):
         self.gpio: Pin = None
         self.pin_number: int = pin_number
         self.enabled: bool = False
+        self.set_debug(debug)
+
+    def set_debug(self, debug: bool):
+        """Enable or disable debug printing."""
         self.debug: bool = debug
+        # with debug off, self.print is a no-op instead of a method checking the flag
+        self.print = print if debug else _no_print
+
+    def _claim_state_machine(self, state_machine: int):
+        """Reserve a PIO state machine id, failing if another instance already uses it."""
+        if state_machine in _state_machines_in_use:
+            raise OSError(f"state_machine {state_machine} is already in use")
+        _state_machines_in_use.add(state_machine)
 
-    def print(self, *args, **kwargs):
+    def _release_state_machine(self, state_machine: int):
+        _state_machines_in_use.discard(state_machine)
+
+    def _dbg(self, fmt: str, *args):
+        """Print fmt.format(*args), formatting only when debug is enabled."""
         if self.debug:
-            print(*args, **kwargs)
+            print(fmt.format(*args))
 
 
 class RFIncomingMessage:
@@ -63,11 +93,44 @@ class RFIncomingMessage:
         self.proto = proto
 
     def __repr__(self) -> str:
-        _msg = f"RFIncomingMessage:(CODE:{self.code},"
-        _msg = _msg + f" CODE_TIMESTAMP:{self.code_timestamp},"
-        _msg = _msg + f" BITLENGTH:{self.bitlength},"
-        _msg = _msg + f" PULSE_LENGTH:{self.pulse_length}, PROTO:{self.proto})"
-        return _msg
+        # a single literal, Micropython can't join adjacent f-strings with fields
+        return f"RFIncomingMessage:(CODE:{self.code}, CODE_TIMESTAMP:{self.code_timestamp}, BITLENGTH:{self.bitlength}, PULSE_LENGTH:{self.pulse_length}, PROTO:{self.proto})"
+
+    def copy(self):
+        """Return a new RFIncomingMessage with the same values."""
+        return RFIncomingMessage(
+            code=self.code,
+            timestamp=self.code_timestamp,
+            bitlength=self.bitlength,
+            pulse_length=self.pulse_length,
+            proto=self.proto,
+        )
+
+
+@rp2.asm_pio(fifo_join=rp2.PIO.JOIN_RX)
+def _rx_edges():
+    """
+    Push a free running down-counter on every edge of the jmp pin.
+
+    Both wait loops take 2 cycles per count, so at 2 MHz the counter ticks once
+    per microsecond. It wraps after ~71 minutes, producing one spurious edge.
+    """
+    mov(x, invert(null))
+    label("low")
+    jmp(pin, "rise")
+    jmp(x_dec, "low")
+    label("rise")
+    mov(isr, x)
+    push(noblock)
+    label("high")
+    jmp(pin, "high_dec")
+    jmp("fall")
+    label("high_dec")
+    jmp(x_dec, "high")
+    label("fall")
+    mov(isr, x)
+    push(noblock)
+    jmp("low")
 
 
 class RFReceiver(RFBase):
@@ -78,12 +141,32 @@ class RFReceiver(RFBase):
         tolerance=80,
         debug: bool = False,
         enable_on_create: bool = True,
+        state_machine: int = None,
     ):
-        """Initialize the RF device."""
+        """
+        Initialize the RF device.
+
+        When state_machine is given, edges are timestamped by that PIO state machine and
+        copied by DMA into a ring buffer which is polled periodically, instead of using a
+        GPIO IRQ per edge. Needs a MicroPython version with rp2.DMA.
+        """
         super().__init__(pin_number=pin_number, debug=debug)
+        if state_machine is not None and not 0 <= state_machine <= 7:
+            # the capture uses the RP2040 PIO0/PIO1 register addresses and DREQ numbers
+            raise ValueError(f"state_machine must be 0-7, got {state_machine}")
         self.tolerance: int = tolerance
+        self.state_machine: int = state_machine
+        self._sm: rp2.StateMachine = None
+        self._dma = None
+        self._timer: Timer = None
         # internal values
-        self._timings: int = [0] * (max_changes + 1)
+        # typed array: stores from the IRQ handler don't allocate int objects. Its size is a
+        # power of two above max_changes, so the store index is bounded with a mask.
+        timings_size = 1 << max_changes.bit_length()
+        self._timings: array = array("i", (0 for _ in range(timings_size)))
+        self._timings_mask: int = timings_size - 1
+        self._max_changes: int = max_changes
+        self._protocols: tuple = PROTOCOLS
         self._last_timestamp: int = 0
         self._change_count: int = 0
         self._repeat_count: int = 0
@@ -94,27 +177,86 @@ class RFReceiver(RFBase):
         self.bitlength = None
         self.pulse_length = None
         self.listeners = []
+        # reused for every notification, listeners must copy() it to keep it
+        self._msg: RFIncomingMessage = RFIncomingMessage()
         if enable_on_create:
             self.enable()
 
     def enable(self):
         """Enable Receiver, set up GPIO and add event detection."""
-        if not self.pin_number:
+        if self.pin_number is None:
             raise OSError(f"pin_number is required")
 
         if not self.enabled:
+            if self.state_machine is not None:
+                self._claim_state_machine(self.state_machine)
             self.enabled = True
             self.gpio = Pin(self.pin_number, Pin.IN, Pin.PULL_DOWN)
-            self.gpio.irq(
-                handler=self._callback, trigger=Pin.IRQ_FALLING | Pin.IRQ_RISING
-            )
+            if self.state_machine is None:
+                self.gpio.irq(
+                    handler=self._callback, trigger=Pin.IRQ_FALLING | Pin.IRQ_RISING
+                )
+            else:
+                self._enable_capture()
             self.print(f"Receiver enabled, pin: {self.pin_number}")
         return True
 
+    def _enable_capture(self):
+        """Start the PIO edge capture, its DMA ring buffer and the polling timer."""
+        ring_bytes = 4 * RX_RING_SIZE
+        # twice the size needed, so a ring aligned to its own size fits inside
+        self._ring: array = array("I", bytes(2 * ring_bytes))
+        self._ring_addr: int = (uctypes.addressof(self._ring) + ring_bytes - 1) & ~(
+            ring_bytes - 1
+        )
+        self._ring_tail: int = 0
+        # last edge stamp and DMA transfers remaining, kept native for _drain
+        self._capture_state: array = array("I", (0xFFFFFFFF, 0xFFFFFFFF))
+
+        pio, sm = divmod(self.state_machine, 4)
+        self._sm = rp2.StateMachine(
+            self.state_machine,
+            _rx_edges,
+            freq=2_000_000,
+            in_base=self.gpio,
+            jmp_pin=self.gpio,
+        )
+        self._dma = rp2.DMA()
+        self._dma.config(
+            # PIOx_RXFy register, DREQ_PIOx_RXy
+            read=(0x50300000 if pio else 0x50200000) + 0x20 + 4 * sm,
+            write=self._ring_addr,
+            count=0xFFFFFFFF,
+            ctrl=self._dma.pack_ctrl(
+                size=2,
+                inc_read=False,
+                inc_write=True,
+                ring_size=ring_bytes.bit_length() - 1,
+                ring_sel=True,
+                treq_sel=(12 if pio else 4) + sm,
+            ),
+            trigger=True,
+        )
+        self._sm.active(1)
+        self._timer = Timer(period=RX_POLL_PERIOD_MS, callback=self._poll)
+
+    def _disable_capture(self):
+        """Stop the PIO edge capture."""
+        self._timer.deinit()
+        self._sm.active(0)
+        self._dma.close()
+        self._timer = None
+        self._sm = None
+        self._dma = None
+        self._release_state_machine(self.state_machine)
+
     def disable(self):
         """Disable Receiver, remove GPIO event detection."""
         if self.enabled:
-            self.gpio.irq(None)
+            if self.state_machine is None:
+                self.gpio.irq(None)
+            else:
+                self._disable_capture()
             self.enabled = False
             self.print("Receiver disabled")
         return True
@@ -122,57 +264,138 @@ class RFReceiver(RFBase):
     # pylint: disable=unused-argument
     def _callback(self, gpio):
         """Receiver callback for GPIO event detection. Handle basic signal detection."""
-        global PROTOCOLS
-        timestamp = time.ticks_us()
-        duration = timestamp - self._last_timestamp
-        if duration > 5000:
-            if abs(duration - self._timings[0]) < 200:
-                self._repeat_count += 1
-                self._change_count -= 1
-                if self._repeat_count == 2:
-                    for pnum in range(1, len(PROTOCOLS)):
-                        if self._waveform(pnum, self._change_count, timestamp):
-                            break
-                    self._repeat_count = 0
-            self._change_count = 0
-
-        if self._change_count >= MAX_CHANGES:
+        timestamp = ticks_us()
+        duration = ticks_diff(timestamp, self._last_timestamp)
+        self._last_timestamp = timestamp
+        change_count = self._edge(duration)
+        if change_count:
+            self._decode(change_count, timestamp)
+            self._push(duration)
+
+    def _poll(self, _):
+        """Timer callback, feed the edges captured by DMA to the signal detection."""
+        self._drain(self._dma.count, ticks_us())
+
+    @micropython.viper
+    def _drain(self, remaining: int, timestamp):
+        """Process the edges the DMA wrote to the ring since the last call."""
+        ring = ptr32(self._ring_addr)
+        state = ptr32(self._capture_state)
+        mask = int(RX_RING_SIZE) - 1
+        tail = int(self._ring_tail)
+        # the DMA transfer count goes down by one per captured edge
+        pending = int(state[1]) - remaining
+        state[1] = remaining
+        if pending > mask:
+            # the DMA lapped the ring, edges were lost: skip them and restart detection
+            tail = (tail + pending) & mask
+            state[0] = ring[(tail - 1) & mask]
+            self._ring_tail = tail
             self._change_count = 0
             self._repeat_count = 0
-        self._timings[self._change_count] = duration
-        self._change_count += 1
-        self._last_timestamp = timestamp
+            return
+
+        last = int(state[0])
+        while pending > 0:
+            stamp = int(ring[tail])
+            # the PIO counter counts down, 32-bit arithmetic handles its wrap
+            duration = last - stamp
+            if duration < 0 or duration > 0x3FFFFFFF:
+                duration = 0x3FFFFFFF
+            last = stamp
+            tail = (tail + 1) & mask
+            pending -= 1
+            change_count = int(self._edge(duration))
+            if change_count:
+                self._decode(change_count, timestamp)
+                self._push(duration)
+        state[0] = last
+        self._ring_tail = tail
+
+    @micropython.viper
+    def _edge(self, duration: int) -> int:
+        """
+        Store an edge duration in the timings buffer.
+
+        When the duration is the sync gap repeating a frame for the second time, nothing is
+        stored and the change count of the frame is returned, so it can be decoded before
+        _push stores the duration. Return 0 otherwise.
+        """
+        timings = ptr32(self._timings)
+        change_count = int(self._change_count)
+        if duration > 5000:
+            frame = 0
+            if change_count > int(self._max_changes):
+                # longer than max_changes, too long to be a frame
+                self._repeat_count = 0
+            else:
+                diff = duration - timings[0]
+                if -200 < diff and diff < 200:
+                    repeat_count = int(self._repeat_count) + 1
+                    if repeat_count == 2:
+                        frame = change_count - 1
+                        repeat_count = 0
+                    self._repeat_count = repeat_count
+            change_count = 0
+            if frame > 0:
+                self._change_count = 0
+                return frame
+
+        timings[change_count & int(self._timings_mask)] = duration
+        # saturate just past max_changes: the frame is too long either way
+        if change_count <= int(self._max_changes):
+            self._change_count = change_count + 1
+        return 0
+
+    @micropython.viper
+    def _push(self, duration: int):
+        """Store an edge duration in the timings buffer."""
+        timings = ptr32(self._timings)
+        change_count = int(self._change_count)
+        timings[change_count & int(self._timings_mask)] = duration
+        self._change_count = change_count + 1
+
+    def _decode(self, change_count, timestamp):
+        """Decode the captured frame with the first matching protocol."""
+        for pnum in range(1, len(self._protocols)):
+            if self._waveform(pnum, change_count, timestamp):
+                return True
+        return False
 
     def _waveform(self, pnum, change_count, timestamp):
         """Detect waveform and format code."""
-        global PROTOCOLS
+        if change_count <= 6:
+            return False
         code = 0
-        delay = int(self._timings[0] / PROTOCOLS[pnum].sync_low)
-        delay_tolerance = delay * self.tolerance / 100
+        timings = self._timings
+        proto = self._protocols[pnum]
+        delay = timings[0] // proto.sync_low
+        tol = delay * self.tolerance // 100
+        # accepted (exclusive) duration windows are constant for the whole frame
+        zh_lo = delay * proto.zero_high - tol
+        zh_hi = zh_lo + 2 * tol
+        zl_lo = delay * proto.zero_low - tol
+        zl_hi = zl_lo + 2 * tol
+        oh_lo = delay * proto.one_high - tol
+        oh_hi = oh_lo + 2 * tol
+        ol_lo = delay * proto.one_low - tol
+        ol_hi = ol_lo + 2 * tol
 
         for i in range(1, change_count, 2):
-            if (
-                abs(self._timings[i] - delay * PROTOCOLS[pnum].zero_high)
-                < delay_tolerance
-                and abs(self._timings[i + 1] - delay * PROTOCOLS[pnum].zero_low)
-                < delay_tolerance
-            ):
-                code <<= 1
-            elif (
-                abs(self._timings[i] - delay * PROTOCOLS[pnum].one_high)
-                < delay_tolerance
-                and abs(self._timings[i + 1] - delay * PROTOCOLS[pnum].one_low)
-                < delay_tolerance
-            ):
-                code <<= 1
-                code |= 1
+            t1 = timings[i]
+            t2 = timings[i + 1]
+            if zh_lo < t1 < zh_hi and zl_lo < t2 < zl_hi:
+                bit = 0
+            elif oh_lo < t1 < oh_hi and ol_lo < t2 < ol_hi:
+                bit = 1
             else:
                 return False
+            code = (code << 1) | bit
 
-        if self._change_count > 6 and code != 0:
+        if code != 0:
             self.code = code
             self.code_timestamp = timestamp
-            self.bitlength = int(change_count / 2)
+            self.bitlength = change_count // 2
             self.pulse_length = delay
             self.proto = pnum
             schedule(self._notify, None)
@@ -187,38 +410,79 @@ class RFReceiver(RFBase):
         self.pulse_length = None
 
     def add_listener(self, listener):
-        #         if hasattr(listener, "__call__"): # doesn't work in MPy
-        if "function" in str(type(listener)):
+        if callable(listener):
             self.print("Added new listener")
             self.listeners.append(listener)
 
     def remove_listener(self, listener):
-        for i, _listener in enumerate(self.listeners):
-            if _listener == listener:
-                self.print("Removed listener")
-                del self.listeners[i]
+        try:
+            self.listeners.remove(listener)
+            self.print("Removed listener")
+        except ValueError:
+            pass
 
     def clear_listeners(self):
         self.listeners = []
 
     def _notify(self, _):
-        new_incoming = RFIncomingMessage(
-            code=self.code,
-            timestamp=self.code_timestamp,
-            bitlength=self.bitlength,
-            pulse_length=self.pulse_length,
-            proto=self.proto,
-        )
+        new_incoming = self._msg
+        new_incoming.code = self.code
+        new_incoming.code_timestamp = self.code_timestamp
+        new_incoming.bitlength = self.bitlength
+        new_incoming.pulse_length = self.pulse_length
+        new_incoming.proto = self.proto
         if self.listeners:
-            self.print(f"Notify new message to {len(self.listeners)} listeners")
+            self._dbg("Notify new message to {} listeners", len(self.listeners))
             for listener in self.listeners:
-                self.print(f"Calling {listener}")
+                self._dbg("Calling {}", listener)
                 listener(new_incoming)
 
 
 """ Transmitter is a work in progress """
 
 
+def _manchester_bits(code: int, length: int) -> int:
+    """Manchester expand the `length` low bits of code one at a time, "1" -> "10" and "0" -> "01"."""
+    expanded = 0
+    for i in range(length - 1, -1, -1):
+        expanded = (expanded << 2) | (0b10 if (code >> i) & 1 else 0b01)
+    return expanded
+
+
+# Manchester expansion of every byte value
+MANCHESTER8 = array("H", (_manchester_bits(b, 8) for b in range(256)))
+
+
+def _manchester(code: int, length: int) -> int:
+    """Manchester expand the `length` low bits of code, a byte at a time."""
+    head = length & 7
+    expanded = _manchester_bits(code >> (length - head), head)
+    for shift in range(length - head - 8, -1, -8):
+        expanded = (expanded << 16) | MANCHESTER8[(code >> shift) & 0xFF]
+    return expanded
+
+
+@rp2.asm_pio(set_init=rp2.PIO.OUT_LOW, fifo_join=rp2.PIO.JOIN_TX)
+def _tx_waveform():
+    """
+    Emit one high/low pulse per pair of FIFO words, one cycle per microsecond.
+
+    The first word is the high time minus 2 cycles, the second the low time minus 6
+    cycles (see RFTransmitter.send_waveform). Both are pulled before the pin goes
+    high, so an empty FIFO only ever stretches a low time.
+    """
+    pull(block)
+    mov(x, osr)
+    pull(block)
+    mov(y, osr)
+    set(pins, 1)
+    label("high")
+    jmp(x_dec, "high")
+    set(pins, 0)
+    label("low")
+    jmp(y_dec, "low")
+
+
 class RFTransmitter(RFBase):
     def __init__(
         self,
@@ -229,9 +493,15 @@ class RFTransmitter(RFBase):
         length: int = 24,
         debug: bool = False,
         enable_on_create: bool = True,
+        state_machine: int = DEFAULT_TRANSMITTER_STATE_MACHINE,
     ):
         global PROTOCOLS
         super().__init__(pin_number=pin_number, debug=debug)
+        if self.pin_number is None:
+            raise OSError(f"pin_number is required.")
+        self.state_machine: int = state_machine
+        self._sm: rp2.StateMachine = None
+        self.us_sleep: int = 0
         self.proto_number = proto_number
         self.pulse_length = PROTOCOLS[self.proto_number].pulse_length
         if pulse_length:
@@ -243,19 +513,27 @@ class RFTransmitter(RFBase):
             self.enable()
 
     def enable(self):
-        """Enable Transmitter, set up GPIO."""
-        if not self.pin_number:
+        """Enable Transmitter, set up GPIO and the PIO state machine."""
+        if self.pin_number is None:
             raise OSError(f"pin_number is required.")
 
         if not self.enabled:
+            self._claim_state_machine(self.state_machine)
             self.enabled = True
-            self.gpio = Pin(self.tx_pin_number, Pin.OUT)
+            self.gpio = Pin(self.pin_number, Pin.OUT)
+            self._sm = rp2.StateMachine(
+                self.state_machine, _tx_waveform, freq=1_000_000, set_base=self.gpio
+            )
+            self._sm.active(1)
             self.print("Transmitter enabled")
         return True
 
     def disable(self):
-        """Disable Transmitter, reset GPIO."""
+        """Disable Transmitter, stop the state machine and reset GPIO."""
         if self.enabled:
+            self._sm.active(0)
+            self._sm = None
+            self._release_state_machine(self.state_machine)
             self.gpio = None
             self.enabled = False
             self.print("Transmitter disabled")
@@ -269,7 +547,6 @@ class RFTransmitter(RFBase):
         When none given reset to default protocol, default pulse_length and set code length to 24 bits.
         """
         self.us_sleep = 0
-        self.start = time.ticks_us()
 
         if proto_number:
             self.proto_number = proto_number
@@ -285,101 +562,92 @@ class RFTransmitter(RFBase):
             self.length = 32
         else:
             self.length = 24
-        raw_code = "{{0:{}b}}".format(self.length + 2).format(code)[2:]
+        raw_code = code & ((1 << self.length) - 1)
         if self.proto_number == 6:
-            nexacode = ""
-            for b in raw_code:
-                if b == "0":
-                    nexacode = nexacode + "01"
-                if b == "1":
-                    nexacode = nexacode + "10"
-            raw_code = nexacode
-            self.length = 64
-        self.print("Transmitter code: ", str(code), " binary: ", raw_code)
+            raw_code = _manchester(raw_code, self.length)
+            self.length = 2 * self.length
+        self._dbg("Transmitter code: {} binary: {:b}", code, raw_code)
         status = self.send_binary(raw_code)
 
         # We must not transmit too often, we also need to make sure we don't corrupt our current message, so wait a bit more between messages if some are chained by caller
         # 500ms seems excessive, should test and reduce when time allows.
         self.us_sleep = self.us_sleep + 500000
 
-        # finish up any pending sleep for 0 bytes - so next transmit code doesn't mess our currently sent one.
-        while time.ticks_us() - self.start < self.us_sleep:
-            time.sleep_us(1)
+        # wait for the state machine to take the last pulse, then for the pulse itself and the gap.
+        while self._sm is not None and self._sm.tx_fifo():
+            sleep_us(100)
+        sleep_us(self.us_sleep)
 
         return status
 
-    def send_binary(self, raw_code):
-        """Send a binary code."""
+    def send_binary(self, raw_code, length=None):
+        """Send a binary code, most significant of its `length` bits first."""
+        if length is None:
+            length = self.length
+        # the protocol is checked once here, not for every bit
+        if not self._bind_protocol():
+            return False
         for _ in range(0, self.repeat):
             if self.proto_number == 6:
-                if not self.send_sync():
+                if not self._send_sync():
                     return False
-            for byte in range(0, self.length):
-                if raw_code[byte] == "0":
-                    if not self.send_l0():
+            for i in range(length - 1, -1, -1):
+                if (raw_code >> i) & 1:
+                    if not self._send_l1():
                         return False
                 else:
-                    if not self.send_l1():
+                    if not self._send_l0():
                         return False
-            if not self.send_sync():
+            if not self._send_sync():
                 return False
 
         return True
 
-    def send_l0(self):
-        """Send a '0' bit."""
+    def _bind_protocol(self):
+        """Validate the protocol and bind its pulse counts for _send_l0, _send_l1 and _send_sync."""
         global PROTOCOLS
         if not 0 < self.proto_number < len(PROTOCOLS):
             self.print("Unknown Transmitter protocol")
             return False
-        return self.send_waveform(
-            PROTOCOLS[self.proto_number].zero_high,
-            PROTOCOLS[self.proto_number].zero_low,
-        )
+        proto = PROTOCOLS[self.proto_number]
+        self._zh, self._zl = proto.zero_high, proto.zero_low
+        self._oh, self._ol = proto.one_high, proto.one_low
+        self._sh, self._sl = proto.sync_high, proto.sync_low
+        return True
+
+    def send_l0(self):
+        """Send a '0' bit."""
+        return self._bind_protocol() and self._send_l0()
 
     def send_l1(self):
         """Send a '1' bit."""
-        global PROTOCOLS
-        if not 0 < self.proto_number < len(PROTOCOLS):
-            self.print("Unknown Transmitter protocol")
-            return False
-        return self.send_waveform(
-            PROTOCOLS[self.proto_number].one_high, PROTOCOLS[self.proto_number].one_low
-        )
+        return self._bind_protocol() and self._send_l1()
 
     def send_sync(self):
         """Send a sync."""
-        global PROTOCOLS
-        if not 0 < self.proto_number < len(PROTOCOLS):
-            self.print("Unknown Transmitter protocol")
-            return False
-        return self.send_waveform(
-            PROTOCOLS[self.proto_number].sync_high,
-            PROTOCOLS[self.proto_number].sync_low,
-        )
+        return self._bind_protocol() and self._send_sync()
+
+    # unchecked variants for send_binary, which binds the protocol once per code
+    def _send_l0(self):
+        return self.send_waveform(self._zh, self._zl)
+
+    def _send_l1(self):
+        return self.send_waveform(self._oh, self._ol)
+
+    def _send_sync(self):
+        return self.send_waveform(self._sh, self._sl)
 
     def send_waveform(self, high_pulses, low_pulses):
-        """Send basic waveform."""
+        """Queue a basic waveform on the transmitter state machine."""
         if not self.enabled:
             self.print("Transmitter is not enabled, not sending data")
             return False
 
-        while time.ticks_us() - self.start < self.us_sleep:
-            time.sleep_us(1)
-
-        self.gpio.value(1)
-        self.start = time.ticks_us()
-
-        self.us_sleep = int(
-            high_pulses * self.pulse_length
-        )  # - int(int(high_pulses * self.pulse_length)/100)
-        while time.ticks_us() - self.start < self.us_sleep:
-            time.sleep_us(1)
-
-        self.gpio.value(0)
-        self.start = time.ticks_us()
-        self.us_sleep = int(
-            low_pulses * self.pulse_length
-        )  # - int(int(low_pulses * self.pulse_length)/100)
+        high_us = int(high_pulses * self.pulse_length)
+        low_us = int(low_pulses * self.pulse_length)
+        # the program adds 2 cycles to the high time and 6 to the low time
+        self._sm.put(max(high_us - 2, 0))
+        self._sm.put(max(low_us - 6, 0))
+        self.us_sleep = high_us + low_us
 
         return True
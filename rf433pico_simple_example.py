@@ -1,14 +1,25 @@
-import time
-from rf433pico import RFReceiver
+import uasyncio
+from rf433pico import RFReceiver, RFIncomingMessage
 
 # Creating a new RFReceiver instance
 receiver = RFReceiver(pin_number=18, debug=True)
 # Enabling receiver
 receiver.enable()
 
+# Set by the listener, wakes up the main task when a code arrives
+new_code = uasyncio.ThreadSafeFlag()
 
-while True:
-    if receiver.code and receiver.code_timestamp:
+
+def on_code(incoming_message: RFIncomingMessage):
+    new_code.set()
+
+
+receiver.add_listener(on_code)
+
+
+async def main():
+    while True:
+        await new_code.wait()
         print(
             '{ "code": "'
             + str(receiver.code)
@@ -19,4 +30,6 @@ while True:
             + '" }'
         )
         receiver.clear()
-    time.sleep(0.05)
+
+
+uasyncio.run(main())